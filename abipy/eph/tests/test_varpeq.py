@@ -0,0 +1,88 @@
+"""Tests for varpeq module."""
+import numpy as np
+import pandas as pd
+
+from unittest import mock
+from abipy.core.testing import AbipyTest
+from abipy.tools.numtools import gaussian
+import abipy.eph.varpeq as varpeq
+
+
+class VarpeqHelpersTest(AbipyTest):
+
+    def test_gaussian_dos(self):
+        """Testing _gaussian_dos."""
+        rng = np.random.default_rng(seed=0)
+        mesh = np.linspace(-2, 2, num=50)
+        centers = rng.uniform(-1.5, 1.5, size=(37,))
+        weights = rng.uniform(0, 1, size=(37,))
+        width = 0.1
+
+        ref = sum(w * gaussian(mesh, width, center=c) for c, w in zip(centers, weights))
+        self.assert_almost_equal(varpeq._gaussian_dos(mesh, centers, weights, width), ref)
+
+        # Chunks of 8 centers: 37 = 4 * 8 + 5 so that the last chunk is partial.
+        with mock.patch.object(varpeq, "_DOS_CHUNK_SIZE", 8 * len(mesh)):
+            self.assert_almost_equal(varpeq._gaussian_dos(mesh, centers, weights, width), ref)
+
+        # Multi-dimensional arrays are flattened.
+        dos = varpeq._gaussian_dos(mesh, centers[:36].reshape(6, 6), weights[:36].reshape(6, 6), width)
+        ref = sum(w * gaussian(mesh, width, center=c) for c, w in zip(centers[:36], weights[:36]))
+        self.assert_almost_equal(dos, ref)
+
+        with self.assertRaises(ValueError):
+            varpeq._gaussian_dos(mesh, centers, weights[:-1], width)
+
+    def test_linfit_prefixes(self):
+        """Testing _linfit_prefixes."""
+        rng = np.random.default_rng(seed=1)
+        xs = np.array([0.5, 0.4, 0.25, 0.2, 0.1])
+        ys_mat = rng.normal(size=(3, len(xs)))
+
+        slopes, intercepts = varpeq._linfit_prefixes(xs, ys_mat)
+        assert slopes.shape == intercepts.shape == (3, len(xs) - 1)
+        for ilab, ys in enumerate(ys_mat):
+            for n in range(2, len(xs) + 1):
+                ref_slope, ref_intercept = np.polyfit(xs[:n], ys[:n], deg=1)
+                self.assert_almost_equal(slopes[ilab, n - 2], ref_slope)
+                self.assert_almost_equal(intercepts[ilab, n - 2], ref_intercept)
+
+        # 1D ordinates are promoted to a single label.
+        slopes_1d, intercepts_1d = varpeq._linfit_prefixes(xs, ys_mat[0])
+        self.assert_almost_equal(slopes_1d, slopes[:1])
+        self.assert_almost_equal(intercepts_1d, intercepts[:1])
+
+        # Repeated abscissas: no unique line through the first two points --> nan.
+        xs = np.array([0.5, 0.5, 0.25, 0.2])
+        slopes, intercepts = varpeq._linfit_prefixes(xs, ys_mat[:, :4])
+        assert np.all(np.isnan(slopes[:, 0])) and np.all(np.isnan(intercepts[:, 0]))
+        assert np.all(np.isfinite(slopes[:, 1:])) and np.all(np.isfinite(intercepts[:, 1:]))
+        for ilab, ys in enumerate(ys_mat[:, :4]):
+            for n in range(3, len(xs) + 1):
+                self.assert_almost_equal(intercepts[ilab, n - 2], np.polyfit(xs[:n], ys[:n], deg=1)[1])
+
+    def test_kconv_fits(self):
+        """Testing _kconv_fits with more than one polaronic state."""
+        # Three files with two polaronic states each, rows ordered as in VarpeqRobot.get_final_results_df.
+        xs = np.array([0.3, 0.2, 0.1])
+        nstates = 2
+        data = {"pstate": np.tile(np.arange(nstates), len(xs)), "spin": 0,
+                "invsc_size": np.repeat(xs, nstates)}
+        for ix, name in enumerate(varpeq._ALL_ENTRIES):
+            # Exact linear dependence with different intercepts for the two states.
+            data[name] = (ix + 1) * data["invsc_size"] - 10 * data["pstate"] + ix
+        df = pd.DataFrame(data)
+
+        fits = varpeq._kconv_fits(df)
+        assert [f[0] for f in fits] == list(range(nstates))
+        for pstate, fxs, ys_mat, slopes, intercepts in fits:
+            self.assert_almost_equal(fxs, xs)
+            assert ys_mat.shape == (len(varpeq._ALL_ENTRIES), len(xs))
+            assert slopes.shape == intercepts.shape == (len(varpeq._ALL_ENTRIES), len(xs) - 1)
+            for ix in range(len(varpeq._ALL_ENTRIES)):
+                self.assert_almost_equal(slopes[ix], ix + 1)
+                self.assert_almost_equal(intercepts[ix], ix - 10 * pstate)
+
+        df_mp = varpeq._intercepts_to_df(fits[1][-1])
+        assert list(df_mp.columns) == list(varpeq._ALL_ENTRIES)
+        assert df_mp.index.name == "npts" and list(df_mp.index) == [2, 3]
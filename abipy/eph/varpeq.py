@@ -26,7 +26,7 @@ from abipy.electrons.ebands import ElectronBands, RobotWithEbands
 from abipy.dfpt.phonons import PhononBands
 from abipy.dfpt.ddb import DdbFile
 from abipy.tools.typing import Figure
-from abipy.tools.numtools import BzRegularGridInterpolator, gaussian
+from abipy.tools.numtools import BzRegularGridInterpolator
 from abipy.iotools import bxsf_write
 from abipy.abio.robots import Robot
 from abipy.eph.common import BaseEphReader
@@ -107,6 +107,124 @@ _ALL_ENTRIES = [
 # Convert to dictionary: name --> Entry
 _ALL_ENTRIES = {e.name: e for e in _ALL_ENTRIES}
 
+# Latex labels and gradient mask in the same order as _ALL_ENTRIES. Used to plot all the entries at once.
+_ENTRY_LATEX = np.array([e.latex for e in _ALL_ENTRIES.values()], dtype=object)
+_ENTRY_IS_GRAD = np.array([e.utype == "gradient" for e in _ALL_ENTRIES.values()])
+
+
+def _abs2(z) -> np.ndarray:
+    """Return |z|^2 without computing the square root in np.abs."""
+    return z.real * z.real + z.imag * z.imag
+
+
+def _stack_entries(df: pd.DataFrame) -> np.ndarray:
+    """
+    Return (nlabels, npts) array with the values of the _ALL_ENTRIES columns of df.
+    Entries are along the first axis so that the data of each entry is contiguous.
+    """
+    # Extract all the columns in a single buffer then transpose.
+    return np.ascontiguousarray(df[list(_ALL_ENTRIES)].to_numpy(dtype=float).T)
+
+
+def _linfit_prefixes(xs, ys_mat) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Linear least-squares fits y = slope * x + intercept performed with the first n points, for n = 2, ..., len(xs).
+    All the fits are computed in closed form from the running sums of x, y, x*y and x^2.
+
+    Args:
+        xs: (npts,) array with the abscissas.
+        ys_mat: (nlabels, npts) array with the ordinates.
+
+    Return: (slopes, intercepts) arrays of shape (nlabels, npts - 1).
+        Column i gives the fit performed with the first i + 2 points.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys_mat = np.ascontiguousarray(np.atleast_2d(ys_mat), dtype=float)
+
+    # Drop the single-point prefix before dividing.
+    ns = np.arange(2, len(xs) + 1)
+    sx, sxx = np.cumsum(xs)[1:], np.cumsum(xs * xs)[1:]
+    sy, sxy = np.cumsum(ys_mat, axis=1)[:, 1:], np.cumsum(xs * ys_mat, axis=1)[:, 1:]
+
+    # The denominator does not depend on the label so it's computed only once.
+    # Degenerate abscissas give nan as there's no unique solution.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_det = 1.0 / (ns * sxx - sx * sx)
+        slopes = (ns * sxy - sx * sy) * inv_det
+    intercepts = (sy - slopes * sx) / ns
+
+    return slopes, intercepts
+
+
+def _intercepts_to_df(intercepts) -> pd.DataFrame:
+    """
+    Build dataframe with the extrapolated values from the (nlabels, npts - 1) array returned by _linfit_prefixes.
+    The index gives the number of points used in the fit.
+    """
+    return pd.DataFrame(intercepts.T, columns=list(_ALL_ENTRIES),
+                        index=pd.RangeIndex(start=2, stop=intercepts.shape[1] + 2, name="npts"))
+
+
+def _kconv_fits(df: pd.DataFrame) -> list[tuple]:
+    """
+    Linear fits of the _ALL_ENTRIES columns of df wrt the inverse supercell size (see _linfit_prefixes).
+    The fits are performed separately for each polaronic state so that different states are never mixed.
+
+    Return: list of (pstate, xs, ys_mat, slopes, intercepts) tuples ordered by pstate.
+    """
+    fits = []
+    for pstate, df_state in df.groupby("pstate", sort=True):
+        xs = df_state["invsc_size"].to_numpy(dtype=float)
+        ys_mat = _stack_entries(df_state)
+        slopes, intercepts = _linfit_prefixes(xs, ys_mat)
+        fits.append((int(pstate), xs, ys_mat, slopes, intercepts))
+
+    return fits
+
+
+# Max number of elements in the (nmesh, ncenters) work array used to compute DOS-like quantities.
+_DOS_CHUNK_SIZE = 2 ** 22
+
+
+def _gaussian_dos(mesh, centers, weights, width) -> np.ndarray:
+    """
+    Return sum_i weights[i] * gaussian(mesh, width, center=centers[i]).
+    The centers are processed in chunks and the gaussians are evaluated in-place
+    in a single preallocated work array so that no temporary is created inside the loop.
+
+    Args:
+        mesh: Linear mesh.
+        centers: Array with the centers of the gaussians. Flattened internally.
+        weights: Array with the weights. Same shape as centers.
+        width: Standard deviation of the gaussian.
+    """
+    mesh = np.asarray(mesh, dtype=float)
+    centers, weights = np.ravel(centers), np.ravel(weights)
+    if len(centers) != len(weights):
+        raise ValueError(f"{len(centers)=} != {len(weights)=}")
+
+    # Constants of the gaussian are computed once.
+    inv_norm = 1.0 / (width * np.sqrt(2 * np.pi))
+    minus_inv_two_s2 = -0.5 / (width * width)
+
+    dos = np.zeros(len(mesh))
+    step = max(1, min(len(centers), _DOS_CHUNK_SIZE // len(mesh)))
+    work_buf = np.empty((len(mesh), step))
+
+    for start in range(0, len(centers), step):
+        cs, ws = centers[start:start+step], weights[start:start+step]
+        work = work_buf[:, :len(cs)]
+        np.subtract(mesh[:, None], cs[None, :], out=work)
+        np.square(work, out=work)
+        work *= minus_inv_two_s2
+        np.exp(work, out=work)
+        dos += work @ ws
+
+    # The normalization factor of the gaussian is applied once at the end.
+    dos *= inv_norm
+
+    return dos
+
 
 class VarpeqFile(AbinitNcFile, Has_Structure, Has_ElectronBands, NotebookWriter):
     """
@@ -161,12 +279,13 @@ class VarpeqFile(AbinitNcFile, Has_Structure, Has_ElectronBands, NotebookWriter)
 
         ksampling = self.ebands.kpoints.ksampling
         ngkpt, shifts = ksampling.mpdivs, ksampling.shifts
-        nkbz = np.prod(ngkpt)
+        nkbz = int(ngkpt[0]) * int(ngkpt[1]) * int(ngkpt[2])
+        volume = self.structure.lattice.volume
 
         od = dict([
             ("nkbz", nkbz),
             ("ngkpt", ngkpt),
-            ("invsc_size", 1.0 / (nkbz * ((abu.Ang_Bohr * self.structure.lattice.volume) ** (1/3)))),
+            ("invsc_size", 1.0 / (nkbz * ((abu.Ang_Bohr * volume) ** (1/3)))),
             ("frohl_ntheta", r.frohl_ntheta),
         ])
         return od
@@ -240,6 +359,10 @@ class Polaron:
     bstop: int         # Last band (python convention)
     varpeq: VarpeqFile
 
+    # True if |A_pnk|^2 and |B_pqnu|^2 should be stored in single precision.
+    # Note that this is a class attribute and not a dataclass field.
+    use_fp32_abs2 = False
+
     @classmethod
     def from_varpeq(cls, varpeq: VarpeqFile, spin: int) -> Polaron:
         """
@@ -265,22 +388,34 @@ class Polaron:
     @lazy_property
     def kpoints(self) -> np.ndarray:
         """Reduced coordinates of the k-points."""
-        return self.varpeq.r.read_value("kpts_spin")[self.spin, :self.nk]
+        return self.varpeq.r.kpts_spin[self.spin, :self.nk]
 
     @lazy_property
     def qpoints(self) -> np.ndarray:
         """Reduced coordinates of the q-points."""
-        return self.varpeq.r.read_value("qpts_spin")[self.spin, :self.nq]
+        return self.varpeq.r.qpts_spin[self.spin, :self.nq]
 
     @lazy_property
     def a_kn(self) -> np.ndarray:
         """A_{pnk} coefficients for this spin."""
-        return self.varpeq.r.read_value("a_spin", cmode="c")[self.spin, :self.nstates, :self.nk, :self.nb]
+        return self.varpeq.r.read_a_spin(self.spin)
 
     @lazy_property
     def b_qnu(self) -> np.ndarray:
         """B_{pqnu} coefficients for this spin."""
-        return self.varpeq.r.read_value("b_spin", cmode="c")[self.spin, :self.nstates, :self.nq]
+        return self.varpeq.r.read_b_spin(self.spin)
+
+    @lazy_property
+    def a2_kn(self) -> np.ndarray:
+        """|A_{pnk}|^2 for this spin. Same shape as a_kn."""
+        a2_kn = _abs2(self.a_kn)
+        return a2_kn.astype(np.float32) if self.use_fp32_abs2 else a2_kn
+
+    @lazy_property
+    def b2_qnu(self) -> np.ndarray:
+        """|B_{pqnu}|^2 for this spin. Same shape as b_qnu."""
+        b2_qnu = _abs2(self.b_qnu)
+        return b2_qnu.astype(np.float32) if self.use_fp32_abs2 else b2_qnu
 
     @lazy_property
     def scf_df_state(self) -> list[pd.DataFrame]:
@@ -297,24 +432,15 @@ class Polaron:
         #   1 --> calculation is converged
         spin = self.spin
         r = self.varpeq.r
-        nstep2cv = r.read_variable("nstep2cv_spin")[spin]
-        scf_hist = r.read_variable("scf_hist_spin")[spin]
-        cvflag = r.read_variable("cvflag_spin")[spin]
-
-        def ufact_k(k):
-            """Convert energies to eV"""
-            entry = _ALL_ENTRIES[k]
-            if entry.utype == "energy":
-                return abu.Ha_eV
-            if entry.utype == "gradient":
-                return 1.0
-            raise ValueError(f"Don't know how to convert {entry=}")
+        nstep2cv = r.nstep2cv_spin[spin]
+        scf_hist = r.scf_hist_ev_spin[spin]
+        cvflag = r.cvflag_spin[spin]
 
         # Build list of dataframe.
         df_list = []
         for pstate in range(self.nstates):
             n = nstep2cv[pstate]
-            dct = {k: scf_hist[pstate, :n, i] * ufact_k(k) for i, k in enumerate(_ALL_ENTRIES)}
+            dct = {k: scf_hist[pstate, :n, i] for i, k in enumerate(_ALL_ENTRIES)}
             df = pd.DataFrame(dct)
             # Add metadata to the attrs dictionary
             df.attrs["converged"] = bool(cvflag[pstate])
@@ -327,17 +453,22 @@ class Polaron:
         Return daframe with the last iteration for all polaronic states.
         NB: Energies are in eV.
         """
-        row_list = []
-        for pstate in range(self.nstates):
-            df = self.scf_df_state[pstate]
-            row = {"pstate": pstate, "spin": self.spin}
-            row.update(df.iloc[-1].to_dict())
-            row["converged"] = df.attrs["converged"]
-            if with_params:
-                row.update(self.varpeq.params)
-            row_list.append(row)
-
-        return pd.DataFrame(row_list)
+        r = self.varpeq.r
+        # (nstates, six) array with the last SCF iteration of each state taken from the cached SCF history.
+        nstep2cv = r.nstep2cv_spin[self.spin]
+        last_iter = r.scf_hist_ev_spin[self.spin, np.arange(self.nstates), nstep2cv - 1]
+        cvflag = r.cvflag_spin[self.spin]
+
+        # Build the columns directly from the arrays.
+        nstates = self.nstates
+        columns = {"pstate": np.arange(nstates), "spin": np.full(nstates, self.spin)}
+        columns.update({name: last_iter[:, i] for i, name in enumerate(_ALL_ENTRIES)})
+        columns["converged"] = cvflag[:nstates].astype(bool)
+        if with_params:
+            # NB: some parameters are arrays e.g. ngkpt hence we need a list with one item per row.
+            columns.update({k: [v] * nstates for k, v in self.varpeq.params.items()})
+
+        return pd.DataFrame(columns)
 
     def __str__(self) -> str:
         return self.to_string()
@@ -361,7 +492,7 @@ class Polaron:
         app(f"q-mesh: {ngqpt}")
         if verbose:
             for pstate in range(self.nstates):
-                app("For %d: 1/N_k sum_nk |A_nk|^2: %f" % (pstate, np.sum(np.abs(self.a_kn[pstate]) ** 2) / self.nk))
+                app("For %d: 1/N_k sum_nk |A_nk|^2: %f" % (pstate, self.a2_kn[pstate].sum() / self.nk))
 
         return "\n".join(lines)
 
@@ -380,6 +511,21 @@ class Polaron:
 
         return ngkpt, shifts
 
+    @lazy_property
+    def k_indices(self) -> np.ndarray:
+        """
+        (nk, 3) array with the indices of the k-points in the k-mesh.
+        """
+        ngkpt, shifts = self.ngkpt_and_shifts
+        return kpoints_indices(self.kpoints, ngkpt)
+
+    @lazy_property
+    def q_indices(self) -> np.ndarray:
+        """
+        (nq, 3) array with the indices of the q-points in the q-mesh (always Gamma-centered).
+        """
+        return kpoints_indices(self.qpoints, self.varpeq.r.ngqpt)
+
     def get_title(self, with_gaps: bool=True) -> str:
         """
         Return string with title for matplotlib plots.
@@ -399,17 +545,14 @@ class Polaron:
         """
         # Need to know the shape of the k-mesh.
         ngkpt, shifts = self.ngkpt_and_shifts
-        k_indices = kpoints_indices(self.kpoints, ngkpt)
+        ix, iy, iz = self.k_indices[:,0], self.k_indices[:,1], self.k_indices[:,2]
         nx, ny, nz = ngkpt
 
         shape = (self.nstates, self.nb, nx, ny, nz)
         a_data = np.empty(shape, dtype=complex) if fill_value is None else np.full(shape, fill_value, dtype=complex)
 
-        for ip in range(self.nstates):
-            for ib in range(self.nb):
-                for a_cplx, k_inds in zip(self.a_kn[ip,:,ib], k_indices, strict=True):
-                    ix, iy, iz = k_inds
-                    a_data[ip, ib, ix, iy, iz] = a_cplx
+        # Scatter (nstates, nk, nb) --> (nstates, nb, nkx, nky, nkz) with a single fancy-index assignment.
+        a_data[:, :, ix, iy, iz] = np.swapaxes(self.a_kn, 1, 2)
 
         return a_data, ngkpt, shifts
 
@@ -420,7 +563,7 @@ class Polaron:
         """
         # Need to know the shape of the q-mesh (always Gamma-centered)
         ngqpt, shifts = self.varpeq.r.ngqpt, [0, 0, 0]
-        q_indices = kpoints_indices(self.qpoints, ngqpt)
+        ix, iy, iz = self.q_indices[:,0], self.q_indices[:,1], self.q_indices[:,2]
 
         natom3 = 3 * len(self.structure)
         nx, ny, nz = ngqpt
@@ -428,30 +571,58 @@ class Polaron:
         shape = (self.nstates, natom3, nx, ny, nz)
         b_data = np.empty(shape, dtype=complex) if fill_value is None else np.full(shape, fill_value, dtype=complex)
 
-        for ip in range(self.nstates):
-            for nu in range(natom3):
-                for b_cplx, q_inds in zip(self.b_qnu[ip,:,nu], q_indices, strict=True):
-                    ix, iy, iz = q_inds
-                    b_data[ip, nu, ix, iy, iz] = b_cplx
+        # Scatter (nstates, nq, natom3) --> (nstates, natom3, nqx, nqy, nqz) with a single fancy-index assignment.
+        b_data[:, :, ix, iy, iz] = np.swapaxes(self.b_qnu, 1, 2)
 
         return b_data, ngqpt, shifts
 
+    def insert_a2_inbox(self, fill_value=0.0) -> tuple:
+        """
+        Return a2_data, ngkpt, shifts where a2_data is a
+        (nstates, nb, nkx, nky, nkz)) real array with |A_{pnk}|^2 with p the polaron index.
+        Same as insert_a_inbox but the complex box is never allocated.
+        """
+        ngkpt, shifts = self.ngkpt_and_shifts
+        ix, iy, iz = self.k_indices[:,0], self.k_indices[:,1], self.k_indices[:,2]
+        nx, ny, nz = ngkpt
+
+        a2_data = np.full((self.nstates, self.nb, nx, ny, nz), fill_value, dtype=self.a2_kn.dtype)
+        a2_data[:, :, ix, iy, iz] = np.swapaxes(self.a2_kn, 1, 2)
+
+        return a2_data, ngkpt, shifts
+
+    def insert_b2_inbox(self, fill_value=0.0) -> tuple:
+        """
+        Return b2_data, ngqpt, shifts where b2_data is a
+        (nstates, natom3, nqx, nqy, nqz)) real array with |B_{pqnu}|^2 with p the polaron index.
+        Same as insert_b_inbox but the complex box is never allocated.
+        """
+        ngqpt, shifts = self.varpeq.r.ngqpt, [0, 0, 0]
+        ix, iy, iz = self.q_indices[:,0], self.q_indices[:,1], self.q_indices[:,2]
+        natom3 = 3 * len(self.structure)
+        nx, ny, nz = ngqpt
+
+        b2_data = np.full((self.nstates, natom3, nx, ny, nz), fill_value, dtype=self.b2_qnu.dtype)
+        b2_data[:, :, ix, iy, iz] = np.swapaxes(self.b2_qnu, 1, 2)
+
+        return b2_data, ngqpt, shifts
+
     def get_a2_interpolator_state(self) -> BzRegularGridInterpolator:
         """
         Build and return an interpolator for |A_nk|^2 for each polaronic state.
         """
-        a_data, ngkpt, shifts = self.insert_a_inbox()
+        a2_data, ngkpt, shifts = self.insert_a2_inbox()
 
-        return [BzRegularGridInterpolator(self.structure, shifts, np.abs(a_data[pstate])**2, method="linear")
+        return [BzRegularGridInterpolator(self.structure, shifts, a2_data[pstate], method="linear")
                 for pstate in range(self.nstates)]
 
     def get_b2_interpolator_state(self) -> BzRegularGridInterpolator:
         """
         Build and return an interpolator for |B_qnu|^2 for each polaronic state.
         """
-        b_data, ngqpt, shifts = self.insert_b_inbox()
+        b2_data, ngqpt, shifts = self.insert_b2_inbox()
 
-        return [BzRegularGridInterpolator(self.structure, shifts, np.abs(b_data[pstate])**2, method="linear")
+        return [BzRegularGridInterpolator(self.structure, shifts, b2_data[pstate], method="linear")
                 for pstate in range(self.nstates)]
 
     def write_a2_bxsf(self, filepath: PathLike, fill_value=0.0) -> None:
@@ -463,12 +634,18 @@ class Polaron:
             filepath: BXSF filename.
         """
         # NB: the kmesh must be gamma-centered, multiple shifts are not supported.
-        # Init values with 0. This is relevant only if kfiltering is being used.
-        a_data, ngkpt, shifts = self.insert_a_inbox(fill_value=fill_value)
+        ngkpt, shifts = self.ngkpt_and_shifts
+        ix, iy, iz = self.k_indices[:,0], self.k_indices[:,1], self.k_indices[:,2]
+
+        # Compute \sum_n A^2_{pnk} before inserting the values in the box.
+        a2_k = np.sum(self.a2_kn, axis=-1)
+
+        # Init values with fill_value. This is relevant only if kfiltering is being used.
+        a2_data = np.full((self.nstates, *ngkpt), fill_value, dtype=a2_k.dtype)
+        a2_data[:, ix, iy, iz] = a2_k
 
-        # Compute \sum_n A^2_{pnk}.
-        a2_data = np.sum(np.abs(a_data)**2, axis=1)
-        fermie = a2_data.mean()
+        # Average over the k-points in the file so that fill_value does not enter the mean.
+        fermie = float(a2_k.mean())
 
         bxsf_write(filepath, self.structure, 1, self.nstates, ngkpt, a2_data, fermie, unit="Ha")
 
@@ -480,12 +657,18 @@ class Polaron:
             filepath: BXSF filename.
         """
         # NB: qmesh must be gamma-centered, multiple shifts are not supported.
-        # Init values with 0. This is relevant only if kfiltering is being used.
-        b_data, ngqpt, shifts = self.insert_b_inbox(fill_value=fill_value)
+        ngqpt = self.varpeq.r.ngqpt
+        ix, iy, iz = self.q_indices[:,0], self.q_indices[:,1], self.q_indices[:,2]
+
+        # Compute \sum_{\nu} B^2_{pq\nu} before inserting the values in the box.
+        b2_q = np.sum(self.b2_qnu, axis=-1)
 
-        # Compute \sum_{\nu} B^2_{pq\nu}.
-        b2_data = np.sum((np.abs(b_data)**2), axis=1)
-        fermie = b2_data.mean()
+        # Init values with fill_value. This is relevant only if kfiltering is being used.
+        b2_data = np.full((self.nstates, *ngqpt), fill_value, dtype=b2_q.dtype)
+        b2_data[:, ix, iy, iz] = b2_q
+
+        # Average over the q-points in the file so that fill_value does not enter the mean.
+        fermie = float(b2_q.mean())
 
         bxsf_write(filepath, self.structure, 1, self.nstates, ngqpt, b2_data, fermie, unit="Ha")
 
@@ -523,37 +706,27 @@ class Polaron:
             df = self.scf_df_state[pstate]
             niter = len(df)
             xs = np.arange(1, niter + 1)
+            values = df[list(_ALL_ENTRIES)].to_numpy()
+            deltas = np.abs(values - values[-1])
 
             for iax, ax in enumerate(ax_mat[pstate]):
                 # Create a twin Axes sharing the x-axis
-                #grad_ax = ax
                 grad_ax = ax.twinx()
 
-                for ilab, (name, entry) in enumerate(_ALL_ENTRIES.items()):
-                    # Convert energies to Hartree. Keep gradient as it is.
-                    ys = df[name].to_numpy()
-
-                    _ax, energy_like = ax, True
-                    if entry.utype == "gradient":
-                        _ax, energy_like = grad_ax, False
-
-                    if iax == 0:
-                        # Plot values linear scale.
-                        _ax.plot(xs, ys, label=entry.latex)
-                    else:
-                        # Plot deltas in logscale.
-                        _ax.plot(xs, np.abs(ys - ys[-1]), label=entry.latex)
+                # Plot values in linear scale and deltas in logscale.
+                ys = values if iax == 0 else deltas
+                # Energies are plotted on the left axis, the gradient on the twin axis.
+                for _ax, mask in ((ax, ~_ENTRY_IS_GRAD), (grad_ax, _ENTRY_IS_GRAD)):
+                    lines = _ax.plot(xs, ys[:, mask])
+                    for line, label in zip(lines, _ENTRY_LATEX[mask]):
+                        line.set_label(label)
+                    if iax != 0:
                         _ax.set_yscale("log")
 
-                _ax.set_xlim(1, niter)
-
-                if energy_like:
-                    ylabel = "Energy (eV)" if iax == 0 else r"$|\Delta E|$ (eV)"
-                else:
-                    ylabel = r"$|\nabla|$" if iax == 0 else r"$|\Delta |\nabla|$"
-
-                set_grid_legend(_ax, fontsize, xlabel="Iteration") #, ylabel=ylabel)
-                _ax.set_ylabel(ylabel)
+                grad_ax.set_xlim(1, niter)
+                ylabel = r"$|\nabla|$" if iax == 0 else r"$|\Delta |\nabla|$"
+                set_grid_legend(grad_ax, fontsize, xlabel="Iteration") #, ylabel=ylabel)
+                grad_ax.set_ylabel(ylabel)
 
         fig.suptitle(self.get_title(with_gaps=True))
         fig.tight_layout()
@@ -564,7 +737,8 @@ class Polaron:
     def plot_ank_with_ebands(self, ebands_kpath,
                              ebands_kmesh=None, lpratio: int=5, method="gaussian", step: float=0.05, width: float=0.1,
                              nksmall: int=20, normalize: bool=False, with_title=True,
-                             ax_mat=None, ylims=None, scale=10, marker_color="gold", fontsize=12, **kwargs) -> Figure:
+                             ax_mat=None, ylims=None, scale=10, marker_color="gold", fontsize=12,
+                             verbose=0, **kwargs) -> Figure:
         """
         Plot electron bands with markers with size proportional to |A_nk|^2.
 
@@ -585,6 +759,7 @@ class Polaron:
             scale: Scaling factor for |A_nk|^2.
             marker_color: Color for markers.
             fontsize: fontsize for legends and titles
+            verbose: Verbosity level. If > 1, check the interpolated |A_nk|^2 at the ab-initio k-points.
         """
         nrows, ncols = self.nstates, 2
         gridspec_kw = {'width_ratios': [2, 1]}
@@ -593,24 +768,25 @@ class Polaron:
         # Get interpolators for A_nk
         a2_interp_state = self.get_a2_interpolator_state()
 
-        # DEBUG SECTION
-        #ref_kn = np.abs(self.a_kn) ** 2
-        #for ik, kpoint in enumerate(self.kpoints):
-        #    interp = a2_interp_state[0].eval_kpoint(kpoint)
-        #    print("MAX (A2 ref - A2 interp) at qpoint", kpoint)
-        #    print((np.abs(ref_kn[ik] - interp)).max())
+        if verbose > 1:
+            # DEBUG SECTION: the interpolant should reproduce the ab-initio values.
+            for pstate in range(self.nstates):
+                interp = a2_interp_state[pstate].eval_kpoints(self.kpoints)
+                err = np.abs(self.a2_kn[pstate] - interp).max()
+                print(f"For {pstate=}, max |A2_ref - A2_interp| at the ab-initio k-points: {err}")
 
         df = self.get_final_results_df()
 
         ebands_kpath = ElectronBands.as_ebands(ebands_kpath)
-        ymin, ymax = +np.inf, -np.inf
+        # (nk, nb) array with the energies along the path. Markers are ordered as enes_kpath.ravel()
+        enes_kpath = ebands_kpath.eigens[self.spin, :, self.bstart:self.bstop]
+        nk, nb = enes_kpath.shape
+        x, y = np.repeat(np.arange(nk), nb), enes_kpath.ravel()
+        ymin, ymax = float(y.min()), float(y.max())
+
         for pstate in range(self.nstates):
-            x, y, s = [], [], []
-            for ik, kpoint in enumerate(ebands_kpath.kpoints):
-                enes_n = ebands_kpath.eigens[self.spin, ik, self.bstart:self.bstop]
-                for e, a2 in zip(enes_n, a2_interp_state[pstate].eval_kpoint(kpoint), strict=True):
-                    x.append(ik); y.append(e); s.append(scale * a2)
-                    ymin, ymax = min(ymin, e), max(ymax, e)
+            a2_kpath = a2_interp_state[pstate].eval_kpoints(ebands_kpath.kpoints)
+            s = scale * a2_kpath.ravel()
 
             points = Marker(x, y, s, color=marker_color, edgecolors='gray', alpha=0.8, label=r'$|A_{n\mathbf{k}}|^2$')
             ax = ax_mat[pstate, 0]
@@ -628,9 +804,8 @@ class Polaron:
             if pstate != self.nstates - 1:
                 set_visible(ax, False, *["legend", "xlabel"])
 
-        vertices_names = [(k.frac_coords, k.name) for k in ebands_kpath.kpoints]
-
         if ebands_kmesh is None:
+            vertices_names = list(zip(ebands_kpath.kpoints.frac_coords, ebands_kpath.kpoints.names))
             print(f"Computing ebands_kmesh with star-function interpolation and {nksmall=} ...")
             edos_ngkpt = self.structure.calc_ngkpt(nksmall)
             r = self.ebands.interpolate(lpratio=lpratio, vertices_names=vertices_names, kmesh=edos_ngkpt)
@@ -648,16 +823,16 @@ class Polaron:
         # NB: A_nk does not necessarily have the symmetry of the lattice so we have to loop over the full BZ.
         # Here we get the mapping BZ --> IBZ needed to obtain the KS eigenvalues e_nk from the IBZ for the DOS.
         kmesh = ebands_kmesh.get_bz2ibz_bz_points()
+        nkbz = int(np.prod(kmesh.ngkpt))
+        enes_bz = ebands_kmesh.eigens[self.spin, kmesh.bz2ibz, self.bstart:self.bstop]
+        enes_ibz = ebands_kmesh.eigens[self.spin, :, self.bstart:self.bstop]
+        weights_ibz = ebands_kmesh.kpoints.weights
 
         for pstate in range(self.nstates):
             # Compute A^2(E) DOS with A_nk in the full BZ
-            ank_dos = np.zeros(len(edos_mesh))
-            for ik_ibz, kpoint in zip(kmesh.bz2ibz, kmesh.bz_kpoints):
-                enes_n = ebands_kmesh.eigens[self.spin, ik_ibz, self.bstart:self.bstop]
-                a2_n = a2_interp_state[pstate].eval_kpoint(kpoint)
-                for e, a2 in zip(enes_n, a2_n):
-                    ank_dos += a2 * gaussian(edos_mesh, width, center=e-e0)
-            ank_dos /= np.product(kmesh.ngkpt)
+            a2_bz = a2_interp_state[pstate].eval_kpoints(kmesh.bz_kpoints)
+            ank_dos = _gaussian_dos(edos_mesh, enes_bz - e0, a2_bz, width)
+            ank_dos /= nkbz
             ank_dos = Function1D(edos_mesh, ank_dos)
             print(f"For {pstate=}, A^2(E) integrates to:", ank_dos.integral_value, " Ideally, it should be 1.")
 
@@ -670,12 +845,8 @@ class Polaron:
             # A2_IBZ(E) should be equal to A2(E) only if A_nk fullfills the lattice symmetries. See notes above.
             with_ibz_a2dos = True
             if with_ibz_a2dos:
-                ank_dos = np.zeros(len(edos_mesh))
-                for ik_ibz, kpoint in enumerate(ebands_kmesh.kpoints):
-                    weight = kpoint.weight
-                    enes_n = ebands_kmesh.eigens[self.spin, ik_ibz, self.bstart:self.bstop]
-                    for e, a2 in zip(enes_n, a2_interp_state[pstate].eval_kpoint(kpoint), strict=True):
-                        ank_dos += weight * a2 * gaussian(edos_mesh, width, center=e-e0)
+                a2_ibz = a2_interp_state[pstate].eval_kpoints(ebands_kmesh.kpoints)
+                ank_dos = _gaussian_dos(edos_mesh, enes_ibz - e0, weights_ibz[:, None] * a2_ibz, width)
                 ank_dos = Function1D(edos_mesh, ank_dos)
                 print(f"For {pstate=}, A2_IBZ(E) integrates to:", ank_dos.integral_value, " Ideally, it should be 1.")
                 ank_dos.plot_ax(ax, exchange_xy=True, normalize=normalize, label=r"$A^2_{IBZ}$(E)", color=marker_color, ls="--")
@@ -757,12 +928,13 @@ class Polaron:
         # Get interpolators for B_qnu
         b2_interp_state = self.get_b2_interpolator_state()
 
+        # (nq, natom3) array with the phonon frequencies along the path. Markers are ordered as phfreqs.ravel()
+        nq, natom3 = phbands_qpath.phfreqs.shape
+        x, y = np.repeat(np.arange(nq), natom3), phbands_qpath.phfreqs.ravel()
+
         for pstate in range(self.nstates):
-            x, y, s = [], [], []
-            for iq, qpoint in enumerate(phbands_qpath.qpoints):
-                omegas_nu = phbands_qpath.phfreqs[iq,:]
-                for w, b2 in zip(omegas_nu, b2_interp_state[pstate].eval_kpoint(qpoint), strict=True):
-                    x.append(iq); y.append(w); s.append(scale * b2)
+            b2_qpath = b2_interp_state[pstate].eval_kpoints(phbands_qpath.qpoints)
+            s = scale * b2_qpath.ravel()
 
             ax = ax_mat[pstate, 0]
             points = Marker(x, y, s, color=marker_color, edgecolors='gray', alpha=0.8, label=r'$|B_{\nu\mathbf{q}}|^2$')
@@ -784,7 +956,7 @@ class Polaron:
         phdos = phdos_file.phdos
         phdos_ngqpt = np.diagonal(phdos_file.qptrlatt) # Use same q-mesh as phdos
         phdos_shifts = [0.0, 0.0, 0.0]
-        phdos_nqbz = np.product(phdos_ngqpt)
+        phdos_nqbz = int(np.prod(phdos_ngqpt))
         wmesh = phdos.mesh
 
         # Here we get the mapping BZ --> IBZ needed to obtain the ph frequencies omega_qnu from the IBZ for the DOS.
@@ -796,9 +968,10 @@ class Polaron:
         # Call anaddb (again) to get phonons on the nqpt mesh.
         anaddb_kwargs = {} if anaddb_kwargs is None else anaddb_kwargs
         phbands_qmesh = ddb.anaget_phmodes_at_qpoints(qpoints=bz_qpoints, ifcflag=1, verbose=verbose, **anaddb_kwargs)
-        if len(phbands_qmesh.qpoints) != np.product(phdos_ngqpt):
-            raise RuntimeError(f"{len(phbands_qmesh.qpoints)=} != {np.product(phdos_ngqpt)=}")
+        if len(phbands_qmesh.qpoints) != phdos_nqbz:
+            raise RuntimeError(f"{len(phbands_qmesh.qpoints)=} != {phdos_nqbz=}")
         #print(phbands_qmesh.qpoints)
+        weights_qmesh = phbands_qmesh.qpoints.weights
 
         for pstate in range(self.nstates):
             # TODO New version using the BZ. Requires new VARPEQ.nc file with all symmetries
@@ -810,21 +983,15 @@ class Polaron:
                 freqs_nu = phbands_qmesh.phfreqs[iq_ibz]
                 for w, b2 in zip(freqs_nu, b2_interp_state[pstate].eval_kpoint(qpoint), strict=True)
                     bqnu_dos += b2 gaussian(wmesh, width, center=w)
-            bqnu_dos /= np.product(phdos_ngqpt)
+            bqnu_dos /= phdos_nqbz
             """
 
             # Compute B2(E) using only q-points in the IBZ. This is just for testing.
             # B2_IBZ(E) should be equal to B2(E) only if B_qnu fullfill the lattice symmetries. See notes above.
             #with_ibz_b2dos = True
             #if with_ibz_b2dos:
-            bqnu_dos = np.zeros(len(wmesh))
-            for iq, qpoint in enumerate(phbands_qmesh.qpoints):
-                weight = qpoint.weight
-                #print(weight, 1.0/phdos_nqbz)
-                freqs_nu = phbands_qmesh.phfreqs[iq]
-                for w, b2 in zip(freqs_nu, b2_interp_state[pstate].eval_kpoint(qpoint), strict=True):
-                    bqnu_dos += weight * b2 * gaussian(wmesh, width, center=w)
-
+            b2_qmesh = b2_interp_state[pstate].eval_kpoints(phbands_qmesh.qpoints)
+            bqnu_dos = _gaussian_dos(wmesh, phbands_qmesh.phfreqs, weights_qmesh[:, None] * b2_qmesh, width)
             bqnu_dos = Function1D(wmesh, bqnu_dos)
 
             ax = ax_mat[pstate, 1]
@@ -901,15 +1068,73 @@ class VarpeqReader(BaseEphReader):
         #self.gmode = self.read_string("gstore_gmode")
 
         # Note conversion Fortran --> C for the isym index.
-        self.brange_spin = self.read_value("brange_spin")
-        self.brange_spin[:,0] -= 1
-        self.nb_spin = self.brange_spin[:,1] - self.brange_spin[:,0]
+        br = self.read_value("brange_spin")
+        br[:,0] -= 1
+        self.brange_spin = br
+        self.nb_spin = br[:,1] - br[:,0]
 
         #self.erange_spin = self.read_value("gstore_erange_spin")
         # Total number of k/q points for each spin after filtering (if any)
         #self.glob_spin_nq = self.read_value("gstore_glob_nq_spin")
         #self.glob_nk_spin = self.read_value("gstore_glob_nk_spin")
 
+    @lazy_property
+    def kpts_spin(self) -> np.ndarray:
+        """(nsppol, max_nk, 3) array with the reduced coordinates of the k-points."""
+        return self.read_value("kpts_spin")
+
+    @lazy_property
+    def qpts_spin(self) -> np.ndarray:
+        """(nsppol, max_nq, 3) array with the reduced coordinates of the q-points."""
+        return self.read_value("qpts_spin")
+
+    def read_a_spin(self, spin: int) -> np.ndarray:
+        """
+        Read the complex A_{pnk} coefficients for the given spin with shape (nstates, nk, nb).
+        Only the hyperslab for this spin is read from file.
+        """
+        nk, nb = self.nk_spin[spin], self.nb_spin[spin]
+        # double a_spin(nsppol, nstates, max_nk, max_nb, two)
+        a_kn = self.read_variable("a_spin")[spin, :, :nk, :nb, :]
+        return a_kn[..., 0] + 1j * a_kn[..., 1]
+
+    def read_b_spin(self, spin: int) -> np.ndarray:
+        """
+        Read the complex B_{pqnu} coefficients for the given spin with shape (nstates, nq, natom3).
+        Only the hyperslab for this spin is read from file.
+        """
+        nq = self.nq_spin[spin]
+        # double b_spin(nsppol, nstates, max_nq, natom3, two)
+        b_qnu = self.read_variable("b_spin")[spin, :, :nq, :, :]
+        return b_qnu[..., 0] + 1j * b_qnu[..., 1]
+
+    @lazy_property
+    def nstep2cv_spin(self) -> np.ndarray:
+        """(nsppol, nstates) array with the number of steps to convergence."""
+        return self.read_value("nstep2cv_spin")
+
+    @lazy_property
+    def cvflag_spin(self) -> np.ndarray:
+        """(nsppol, nstates) array with the convergence flag (1 if converged)."""
+        return self.read_value("cvflag_spin")
+
+    @lazy_property
+    def scf_hist_ev_spin(self) -> np.ndarray:
+        """
+        (nsppol, nstates, nstep, six) array with the SCF history.
+        NB: Energies are converted from Ha to eV, the gradient is left as it is.
+        """
+        def ufact(entry):
+            """Convert energies to eV"""
+            if entry.utype == "energy":
+                return abu.Ha_eV
+            if entry.utype == "gradient":
+                return 1.0
+            raise ValueError(f"Don't know how to convert {entry=}")
+
+        ufacts = np.array([ufact(entry) for entry in _ALL_ENTRIES.values()])
+        return self.read_value("scf_hist_spin") * ufacts
+
 
 class VarpeqRobot(Robot, RobotWithEbands):
     """
@@ -968,14 +1193,16 @@ class VarpeqRobot(Robot, RobotWithEbands):
         return df
 
     @add_fig_kwargs
-    def plot_kconv(self, colormap="jet", fontsize=12, **kwargs) -> Figure:
+    def plot_kconv(self, colormap="jet", fontsize=12, verbose=0, **kwargs) -> Figure:
         """
         Plot the convergence of the results wrt to the k-point sampling.
 
         Args:
             colormap: Color map. Have a look at the colormaps here and decide which one you like:
             fontsize: fontsize for legends and titles
+            verbose: Print the values extrapolated to infinite supercell if verbose > 0.
         """
+        from matplotlib.collections import LineCollection
         nsppol = self.getattr_alleq("nsppol")
 
         # Build grid of plots.
@@ -983,24 +1210,42 @@ class VarpeqRobot(Robot, RobotWithEbands):
         ax_mat, fig, plt = get_axarray_fig_plt(None, nrows=nrows, ncols=ncols,
                                                sharex=True, sharey=False, squeeze=False)
         cmap = plt.get_cmap(colormap)
+
+        # Gather the results for all spins only once.
+        df_all = self.get_final_results_df(spin=None, sortby=None)
+
+        # The x-axis is shared so the same mesh is used for all spins.
+        xvals = np.linspace(0.0, 1.1 * df_all["invsc_size"].max(), 100)
+
         for spin in range(nsppol):
-            df = self.get_final_results_df(spin=spin, sortby=None)
-            xs = df["invsc_size"]
-            xvals = np.linspace(0.0, 1.1 * xs.max(), 100)
+            df = df_all[df_all["spin"] == spin]
 
-            for ix, ylabel in enumerate(_ALL_ENTRIES):
-                ax = ax_mat[ix, spin]
-                ys = df[ylabel]
+            # Linear fits with the first nn + 1 points for all the entries, done separately for each polaronic state.
+            for pstate, xs, ys_mat, slopes, intercepts in _kconv_fits(df):
+                if verbose:
+                    print(f"Values extrapolated to infinite supercell for {spin=}, {pstate=}:")
+                    print(_intercepts_to_df(intercepts))
+
+                # Evaluate all the fits on xvals with a single broadcast and store the results
+                # as line segments: shape (nentries, npts - 1, len(xvals), 2)
+                segments = np.empty(slopes.shape + (len(xvals), 2))
+                segments[..., 0] = xvals
+                segments[..., 1] = intercepts[:, :, None] + slopes[:, :, None] * xvals
+                # (npts - 1, 4) RGBA array obtained with a single colormap lookup.
+                colors = cmap(np.arange(len(xs) - 1) / len(xs))
 
-                # Plot ab-initio points.
-                ax.scatter(xs, ys, color="red", marker="o")
+                for ix in range(len(_ALL_ENTRIES)):
+                    ax = ax_mat[ix, spin]
 
-                # Plot fit using the first nn points.
-                for nn in range(1, len(xs)):
-                    color = cmap((nn - 1) / len(xs))
-                    p = np.poly1d(np.polyfit(xs[:nn+1], ys[:nn+1], deg=1))
-                    ax.plot(xvals, p(xvals), color=color, ls="--")
+                    # Plot ab-initio points.
+                    ax.scatter(xs, ys_mat[ix], color="red", marker="o")
 
+                    # Plot the fits using the first nn points with a single artist.
+                    ax.add_collection(LineCollection(segments[ix], colors=colors, linestyles="--"))
+                    ax.autoscale_view()
+
+            for ix, ylabel in enumerate(_ALL_ENTRIES):
+                ax = ax_mat[ix, spin]
                 xlabel = "Inverse supercell size (Bohr$^-1$)" if ix == len(_ALL_ENTRIES) - 1 else None
                 set_grid_legend(ax, fontsize, xlabel=xlabel, ylabel=f"{ylabel} (eV)", legend=False)
                 ax.tick_params(axis='x', color='black', labelsize='20', pad=5, length=5, width=2)
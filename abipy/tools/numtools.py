@@ -584,6 +584,11 @@ class BzRegularGridInterpolator:
         y = np.linspace(0, 1, num=ny)
         z = np.linspace(0, 1, num=nz)
 
+        # Keep a reference to the data for the vectorized trilinear interpolation
+        # used by eval_kpoints when method == "linear" (default in RegularGridInterpolator).
+        self._datak = datak
+        self._use_trilinear = kwargs.get("method", "linear") == "linear" and min(nx, ny, nz) > 1
+
         # Build `ndat` interpolators. Note that RegularGridInterpolator supports
         # [nx, ny, nz, ...] arrays but then each call operates on the full set of
         # ndat components and this complicates the declation of callbacks
@@ -608,18 +613,75 @@ class BzRegularGridInterpolator:
         if hasattr(frac_coords, "frac_coords"):
             frac_coords = frac_coords.frac_coords
 
+        return self.eval_kpoints(np.reshape(frac_coords, (1, 3)), cartesian=cartesian, **kwargs)[0]
+
+    def eval_kpoints(self, frac_coords, cartesian=False, **kwargs) -> np.ndarray:
+        """
+        Interpolate values at a list of k-points.
+        Linear interpolation is performed with vectorized NumPy code for all the components at once.
+        Other methods or extra kwargs are delegated to RegularGridInterpolator.
+
+        Args:
+            frac_coords: [nk, 3] array with reduced coordinates of the k-points unless `cartesian`.
+                Accepts also a |KpointList|.
+            cartesian: True if k-points are in cartesian coordinates.
+            kwargs: Extra arguments are passed to RegularGridInterpolator.__call__
+
+        Return:
+            [nk, ndat] array with interpolated data.
+        """
+        # Handle KpointList object
+        if hasattr(frac_coords, "frac_coords"):
+            frac_coords = frac_coords.frac_coords
+
+        frac_coords = np.reshape(frac_coords, (-1, 3))
         if cartesian:
             red_from_cart = self.structure.reciprocal_lattice.inv_matrix.T
-            frac_coords = np.dot(red_from_cart, frac_coords)
+            frac_coords = np.dot(frac_coords, red_from_cart.T)
 
-        uc_coords = np.reshape(frac_coords, (3,)) % 1
+        uc_coords = frac_coords % 1
 
-        values = np.empty(self.ndat, dtype=self.dtype)
+        if self._use_trilinear and not kwargs:
+            return self._eval_trilinear(uc_coords)
+
+        values = np.empty((len(uc_coords), self.ndat), dtype=self.dtype)
         for idat in range(self.ndat):
-            values[idat] = self._interpolators[idat](uc_coords, **kwargs)
+            values[:, idat] = self._interpolators[idat](uc_coords, **kwargs)
 
         return values
 
+    def _eval_trilinear(self, uc_coords) -> np.ndarray:
+        """
+        Trilinear interpolation at the [nk, 3] points uc_coords in [0, 1).
+        Equivalent to RegularGridInterpolator with method="linear" but all the
+        ndat components and all the points are treated with a single set of gathers.
+
+        Return:
+            [nk, ndat] array with interpolated data.
+        """
+        datak = self._datak
+        inds, ts = [], []
+        for idir, n in enumerate(datak.shape[-3:]):
+            # Grid points are at linspace(0, 1, num=n)
+            f = uc_coords[:, idir] * (n - 1)
+            i0 = np.minimum(f.astype(int), n - 2)
+            inds.append((i0, i0 + 1))
+            ts.append(f - i0)
+
+        (ix0, ix1), (iy0, iy1), (iz0, iz1) = inds
+        tx, ty, tz = ts
+
+        # Interpolate along z, then y, then x. Each array has shape [ndat, nk].
+        c00 = datak[:, ix0, iy0, iz0] * (1 - tz) + datak[:, ix0, iy0, iz1] * tz
+        c01 = datak[:, ix0, iy1, iz0] * (1 - tz) + datak[:, ix0, iy1, iz1] * tz
+        c10 = datak[:, ix1, iy0, iz0] * (1 - tz) + datak[:, ix1, iy0, iz1] * tz
+        c11 = datak[:, ix1, iy1, iz0] * (1 - tz) + datak[:, ix1, iy1, iz1] * tz
+        c0 = c00 * (1 - ty) + c01 * ty
+        c1 = c10 * (1 - ty) + c11 * ty
+
+        values = c0 * (1 - tx) + c1 * tx
+        return np.ascontiguousarray(values.T, dtype=self.dtype)
+
     #def eval_kline(self, point1, point2, num=200, cartesian=False, kpoint=None):
     #    """
     #    Interpolate values along a line.
@@ -1,6 +1,8 @@
 import numpy as np
+import abipy.data as abidata
 
 from abipy.tools.numtools import *
+from abipy.core.structure import Structure
 from abipy.core.testing import AbipyTest
 
 
@@ -67,3 +69,28 @@ class TestNumTools(AbipyTest):
 
         assert lorentzian(x=0.0, width=1.0, center=0.0, height=1.0) == 1.0
         self.assert_almost_equal(lorentzian(x=0.0, width=1.0, center=0.0, height=None), 1/np.pi)
+
+    def test_bz_regular_grid_interpolator(self):
+        """Testing BzRegularGridInterpolator."""
+        structure = Structure.from_file(abidata.cif_file("si.cif"))
+        ngkpt = (4, 3, 2)
+        datak = np.random.rand(2, *ngkpt)
+        interp = BzRegularGridInterpolator(structure, [0, 0, 0], datak, method="linear")
+        assert interp.ndat == 2
+
+        # Grid points should be reproduced exactly, also when shifted by a G-vector.
+        frac_coords = np.array([[0, 0, 0], [0.25, 1/3, 0.5], [1.5, -1/3, 0]])
+        values = interp.eval_kpoints(frac_coords)
+        assert values.shape == (3, 2)
+        self.assert_almost_equal(values[0], datak[:, 0, 0, 0])
+        self.assert_almost_equal(values[1], datak[:, 1, 1, 1])
+        self.assert_almost_equal(values[2], datak[:, 2, 2, 0])
+
+        # Batched and single-point interfaces should agree.
+        frac_coords = np.random.rand(10, 3) - 0.5
+        values = interp.eval_kpoints(frac_coords)
+        for kpt, vals in zip(frac_coords, values):
+            self.assert_almost_equal(vals, interp.eval_kpoint(kpt))
+
+        # The vectorized trilinear interpolation should agree with RegularGridInterpolator.
+        self.assert_almost_equal(values, interp.eval_kpoints(frac_coords, method="linear"))